@@ -5,9 +5,16 @@
 set -e
 
 HOOK_NAME="${1:-manual}"
+# Number of projects analyzed in parallel (override with CTX_ANALYZE_JOBS)
+JOBS="${CTX_ANALYZE_JOBS:-$(getconf _NPROCESSORS_ONLN 2>/dev/null || echo 4)}"
 CONTEXT_ROOT="$(git rev-parse --show-toplevel)"
 cd "$CONTEXT_ROOT"
 
+ANALYZER="skills/ctx-collector/scripts/analyze_project.py"
+# Content fingerprints of analyzed projects ("<org/repo><TAB><fingerprint>")
+FINGERPRINTS="reports/projects/.fingerprints"
+ANALYZER_HASH=$(git hash-object "$ANALYZER" 2>/dev/null || echo "none")
+
 echo "🔄 [$HOOK_NAME] Updating project contexts..."
 
 # Detect changes based on hook type
@@ -25,8 +32,8 @@ case "$HOOK_NAME" in
         CHANGED_FILES=$(git diff --name-only $2 $3 2>/dev/null || echo "")
         ;;
     "manual")
-        # Manual run - analyze all projects
-        CHANGED_FILES=$(find projects -type f | head -1)  # Force update
+        # Manual run - analyze all projects (unchanged ones are skipped below)
+        CHANGED_FILES=$(find projects -mindepth 2 -maxdepth 2 -type d)
         ;;
 esac
 
@@ -34,105 +41,242 @@ esac
 CHANGED_PROJECTS=$(echo "$CHANGED_FILES" | grep "^projects/" | cut -d/ -f2-3 | sort -u || true)
 
 # Find all current projects
-ALL_PROJECTS=$(find projects -mindepth 2 -maxdepth 2 -type d | sed 's|^projects/||' | sort)
+ALL_PROJECTS=$(find projects -mindepth 2 -maxdepth 2 -type d | sed 's|^projects/||' | LC_ALL=C sort)
 
 # Create reports directory
 mkdir -p reports/projects
+touch "$FINGERPRINTS"
+
+# Reports used to be keyed by repo name alone, so two orgs with the same
+# repo name overwrote each other. Drop them and rebuild every project under
+# reports/projects/<org>/<repo>.md
+LEGACY_REPORTS=$(find reports/projects -maxdepth 1 -type f \( -name '*.md' -o -name '*.json' \) \
+    ! -name INDEX.md ! -name index.json)
+if [ -n "$LEGACY_REPORTS" ]; then
+    echo "🔁 Migrating reports to the org/repo layout..."
+    while IFS= read -r report; do
+        rm -f "$report"
+    done <<< "$LEGACY_REPORTS"
+    CHANGED_PROJECTS="$ALL_PROJECTS"
+fi
 
 # Track if any changes were made
 UPDATED=0
 DELETED=0
+RESULTS=""
 
 # Handle changed/added projects
 if [ -n "$CHANGED_PROJECTS" ]; then
     echo "📋 Detected changes in projects:"
-    while IFS= read -r project; do
-        if [ -d "projects/$project" ]; then
-            echo "  📊 Analyzing: $project"
-            python3 skills/ctx-collector/scripts/analyze_project.py \
-                "projects/$project" \
-                --output "reports/projects/$(basename $project).md" \
-                2>/dev/null && UPDATED=$((UPDATED + 1)) || echo "  ⚠️  Failed"
-        fi
-    done <<< "$CHANGED_PROJECTS"
-fi
 
-# Handle deleted projects
-for report in reports/projects/*.md; do
-    [ -f "$report" ] || continue
-    [ "$report" = "reports/projects/INDEX.md" ] && continue
+    # A project's fingerprint is the git tree of its committed files plus the
+    # analyzer blob. Projects with uncommitted changes get none, since the
+    # tree hash would not describe what is on disk.
+    DIRTY_PROJECTS=$(git status --porcelain -z --no-renames --untracked-files=all -- projects/ 2>/dev/null |
+        tr '\0' '\n' | cut -c4- | cut -d/ -f2-3 | sort -u)
+    PROJECT_TREES=$(echo "$ALL_PROJECTS" | cut -d/ -f1 | sort -u | sed '/^$/d; s|.*|projects/&/|' |
+        tr '\n' '\0' | xargs -0 git ls-tree -d -z HEAD -- 2>/dev/null | tr '\0' '\n' |
+        awk -F'\t' '{ split($1, meta, " "); sub(/^projects\//, "", $2); print $2 "\t" meta[3] }')
+    REPORTED_PROJECTS=$(find reports/projects -mindepth 2 -maxdepth 2 -name '*.md' |
+        sed 's|^reports/projects/||; s|\.md$||')
 
-    PROJECT_NAME=$(basename "$report" .md)
+    # Skip projects whose content is unchanged since their report was written.
+    # All inputs are joined in one awk pass that prints
+    # "skip<TAB>project" or "pending<TAB>project<TAB>fingerprint"
+    PLAN=$(awk -F'\t' -v analyzer=":$ANALYZER_HASH" '
+        FILENAME == ARGV[1] { stored[$1] = $2; next }
+        FILENAME == ARGV[2] { tree[$1] = $2; next }
+        FILENAME == ARGV[3] { dirty[$1] = 1; next }
+        FILENAME == ARGV[4] { exists[$1] = 1; next }
+        FILENAME == ARGV[5] { reported[$1] = 1; next }
+        $0 in exists {
+            fingerprint = ""
+            if (!($0 in dirty) && ($0 in tree)) fingerprint = tree[$0] analyzer
+            if (fingerprint != "" && ($0 in reported) && stored[$0] == fingerprint)
+                print "skip\t" $0
+            else
+                print "pending\t" $0 "\t" fingerprint
+        }
+    ' "$FINGERPRINTS" <(echo "$PROJECT_TREES") <(echo "$DIRTY_PROJECTS") \
+        <(echo "$ALL_PROJECTS") <(echo "$REPORTED_PROJECTS") <(echo "$CHANGED_PROJECTS"))
 
-    # Check if project still exists
-    PROJECT_FOUND=0
-    while IFS= read -r project; do
-        if [ "$(basename $project)" = "$PROJECT_NAME" ]; then
-            PROJECT_FOUND=1
-            break
+    PENDING=""
+    while IFS=$'\t' read -r action project fingerprint; do
+        [ -n "$project" ] || continue
+        if [ "$action" = "skip" ]; then
+            echo "  ⏭️  Up to date: $project"
+        else
+            PENDING+="$project"$'\t'"$fingerprint"$'\n'
         fi
-    done <<< "$ALL_PROJECTS"
+    done <<< "$PLAN"
 
-    if [ $PROJECT_FOUND -eq 0 ]; then
-        echo "  🗑️  Removing: $PROJECT_NAME (project deleted)"
-        rm -f "reports/projects/$PROJECT_NAME.md"
-        rm -f "reports/projects/$PROJECT_NAME.json"
-        DELETED=$((DELETED + 1))
+    # Projects are analyzed concurrently; records are NUL-delimited so xargs
+    # does not interpret quotes in project names. Each worker prints
+    # "ok<TAB>project<TAB>fingerprint" on success; the analyzer's own output
+    # goes to stderr so it cannot be mistaken for a result.
+    XARGS_STATUS=0
+    if [ -n "$PENDING" ]; then
+        RESULTS=$(printf '%s' "$PENDING" | tr '\n' '\0' | xargs -0 -n1 -P "$JOBS" bash -c '
+            project=$(cut -f1 <<< "$2")
+            echo "  📊 Analyzing: $project" >&2
+            mkdir -p "reports/projects/$(dirname "$project")"
+            if python3 "$1" \
+                "projects/$project" \
+                --output "reports/projects/$project.md" \
+                >&2 2>/dev/null; then
+                printf "ok\t%s\n" "$2"
+            else
+                echo "  ⚠️  Failed: $project" >&2
+            fi
+        ' _ "$ANALYZER") || XARGS_STATUS=$?
     fi
-done
+    if [ "$XARGS_STATUS" -ne 0 ]; then
+        echo "  ⚠️  Analysis workers exited with status $XARGS_STATUS" >&2
+    fi
+fi
+UPDATED_PROJECTS=$(echo "$RESULTS" | awk -F'\t' '$1 == "ok" { print $2 }')
+UPDATED=$(echo "$UPDATED_PROJECTS" | awk 'NF { n++ } END { print n + 0 }')
 
-# Regenerate index if there were changes
-if [ $UPDATED -gt 0 ] || [ $DELETED -gt 0 ]; then
-    echo "📝 Regenerating project index..."
-    python3 << 'PYEOF'
+# Handle deleted projects: reports whose org/repo no longer exists
+REPORTED_PROJECTS=$(find reports/projects -mindepth 2 -maxdepth 2 -name '*.md' |
+    sed 's|^reports/projects/||; s|\.md$||' | LC_ALL=C sort)
+DELETED_PROJECTS=$(LC_ALL=C comm -23 <(echo "$REPORTED_PROJECTS") <(echo "$ALL_PROJECTS") | sed '/^$/d')
+if [ -n "$DELETED_PROJECTS" ]; then
+    while IFS= read -r project; do
+        echo "  🗑️  Removing: $project (project deleted)"
+        rm -f "reports/projects/$project.md"
+        rm -f "reports/projects/$project.json"
+        rmdir "reports/projects/$(dirname "$project")" 2>/dev/null || true
+        DELETED=$((DELETED + 1))
+    done <<< "$DELETED_PROJECTS"
+fi
+
+# Update the index manifest for changed projects only, then render INDEX.md.
+# The step prints the projects it indexed; only those get a fingerprint below
+INDEXED_PROJECTS=""
+if [ $UPDATED -gt 0 ] || [ $DELETED -gt 0 ] ||
+    [ ! -f reports/projects/index.json ] || [ ! -f reports/projects/INDEX.md ]; then
+    echo "📝 Updating project index..."
+    INDEXED_PROJECTS=$(INDEX_UPDATED="$UPDATED_PROJECTS" INDEX_DELETED="$DELETED_PROJECTS" python3 << 'PYEOF'
 from pathlib import Path
+import hashlib
 import json
+import os
 from datetime import datetime
 from collections import defaultdict
 
 reports_dir = Path("reports/projects")
-index_lines = [
-    "# Project Context Index",
-    "",
-    f"**Generated:** {datetime.now().isoformat()}",
-    f"**Total Projects:** {len(list(reports_dir.glob('*.json')))}",
-    "",
-    "## Quick Links",
-    ""
-]
-
-# Group by organization
-projects_by_org = defaultdict(list)
-
-for json_file in sorted(reports_dir.glob("*.json")):
+manifest_path = reports_dir / "index.json"
+
+
+def project_list(var):
+    return [line for line in os.environ.get(var, "").splitlines() if line]
+
+
+# Load the manifest; on first run, seed it from every existing report
+try:
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    if not isinstance(manifest, dict) or not isinstance(manifest.get("projects"), dict):
+        raise ValueError("malformed manifest")
+    refresh = project_list("INDEX_UPDATED")
+except (OSError, ValueError):
+    manifest = {"version": 1, "projects": {}}
+    refresh = sorted(
+        str(p.relative_to(reports_dir).with_suffix(""))
+        for p in reports_dir.glob("*/*.json")
+    )
+
+projects = manifest["projects"]
+changed = not manifest_path.exists()
+
+for key in project_list("INDEX_DELETED"):
+    if projects.pop(key, None) is not None:
+        changed = True
+
+for key in refresh:
     try:
-        with open(json_file) as f:
-            data = json.load(f)
-            org = data.get("organization", "unknown")
-            projects_by_org[org].append(data)
-    except:
+        raw = (reports_dir / f"{key}.json").read_bytes()
+        data = json.loads(raw)
+    except (OSError, ValueError):
+        continue
+    if not isinstance(data, dict):
         continue
 
-# Generate index by organization
-for org in sorted(projects_by_org.keys()):
-    if org == "unknown":
+    print(key)
+    report_hash = hashlib.sha256(raw).hexdigest()
+    if projects.get(key, {}).get("report_hash") == report_hash:
         continue
 
-    index_lines.append(f"### {org}")
-    index_lines.append("")
+    org, _, repo = key.partition("/")
+    overview = data.get("overview")
+    if not isinstance(overview, dict):
+        overview = {}
+    projects[key] = {
+        "organization": org,
+        "name": str(data.get("name") or repo),
+        "description": str(overview.get("description") or "No description"),
+        "report_hash": report_hash,
+    }
+    changed = True
+
+if changed:
+    manifest["generated"] = datetime.now().isoformat()
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+if changed or not (reports_dir / "INDEX.md").exists():
+    index_lines = [
+        "# Project Context Index",
+        "",
+        f"**Generated:** {manifest.get('generated', datetime.now().isoformat())}",
+        f"**Total Projects:** {len(projects)}",
+        "",
+        "## Quick Links",
+        ""
+    ]
+
+    # Group by organization
+    projects_by_org = defaultdict(list)
+    for key, project in projects.items():
+        projects_by_org[project["organization"]].append((key, project))
 
-    for project in sorted(projects_by_org[org], key=lambda p: p["name"]):
-        name = project["name"]
-        desc = project.get("overview", {}).get("description", "No description")[:100]
-        index_lines.append(f"#### [{name}](projects/{name}.md)")
-        index_lines.append(f"**Description:** {desc}")
+    # Generate index by organization
+    for org in sorted(projects_by_org.keys()):
+        index_lines.append(f"### {org}")
         index_lines.append("")
 
-# Write index
-with open("reports/projects/INDEX.md", "w") as f:
-    f.write("\n".join(index_lines))
+        for key, project in sorted(projects_by_org[org], key=lambda p: p[1]["name"]):
+            name = project["name"]
+            desc = project["description"][:100]
+            index_lines.append(f"#### [{name}]({key}.md)")
+            index_lines.append(f"**Description:** {desc}")
+            index_lines.append("")
+
+    # Write index
+    with open(reports_dir / "INDEX.md", "w") as f:
+        f.write("\n".join(index_lines))
 PYEOF
+)
+fi
 
+# Record fingerprints of freshly analyzed projects and forget deleted ones.
+# Analyzed projects the index step did not take get an empty fingerprint, so
+# they are re-analyzed next time instead of being skipped as up to date
+echo "$RESULTS" | awk -F'\t' '
+    FILENAME == ARGV[1] { indexed[$0] = 1; next }
+    $1 == "ok" { print $2 "\t" (($2 in indexed) ? $3 : "") }
+' <(echo "$INDEXED_PROJECTS") - > "$FINGERPRINTS.new"
+awk -F'\t' '
+    FILENAME == ARGV[1] { fresh[$1] = 1; if ($2 != "") print; next }
+    FILENAME == ARGV[2] { alive[$1] = 1; next }
+    !($1 in fresh) && ($1 in alive)
+' "$FINGERPRINTS.new" <(echo "$ALL_PROJECTS") "$FINGERPRINTS" | LC_ALL=C sort > "$FINGERPRINTS.tmp"
+mv "$FINGERPRINTS.tmp" "$FINGERPRINTS"
+rm -f "$FINGERPRINTS.new"
+
+if [ $UPDATED -gt 0 ] || [ $DELETED -gt 0 ]; then
     echo "✅ Updated: $UPDATED | Deleted: $DELETED"
 else
     echo "✅ No project changes detected"